@@ -1,56 +1,226 @@
 import sys
+import struct
 import hashlib
+import functools
+import zipfile
 import numpy as np
 from PIL import Image
 from PyQt5 import QtWidgets, QtGui, QtCore
 
+# Optional GPU backend: used automatically for large images when CuPy is
+# installed; everything works without it. CuPy can be importable on
+# machines with no usable CUDA device or driver, so probe once here and
+# demote to None unless a device actually answers.
+try:
+    import cupy as cp
+    if cp.cuda.runtime.getDeviceCount() == 0:
+        cp = None
+except Exception:
+    cp = None
+
+# Below this size the PCIe transfer overhead outweighs the GPU win.
+GPU_MIN_BYTES = 8 << 20
+
 # -----------------------
 # Helpers: key -> seed
 # -----------------------
 def key_to_seed(key: str) -> int:
     if isinstance(key, int):
         return int(key) & 0xFFFFFFFF
-    h = hashlib.sha256(key.encode('utf-8')).digest()
-    return int.from_bytes(h[:4], 'big')
+    # Only 4 bytes of digest are consumed, so a full SHA-256 is wasted
+    # work; blake2s with a 4-byte digest is much cheaper on short keys.
+    h = hashlib.blake2s(key.encode('utf-8'), digest_size=4).digest()
+    return int.from_bytes(h, 'big')
 
 # -----------------------
 # Image conversions
 # -----------------------
 def pil_to_numpy(pil_img: Image.Image) -> np.ndarray:
-    return np.array(pil_img.convert('RGB'), dtype=np.uint8)
+    """Convert a PIL image to a uint8 RGB array without an extra copy.
+
+    `np.asarray` goes through PIL's array interface instead of forcing a
+    second copy like `np.array` does. The result may be read-only; every
+    operation here writes into its own output buffer, so that is fine.
+    """
+    return np.asarray(pil_img.convert('RGB'))
 
 def numpy_to_pil(arr: np.ndarray) -> Image.Image:
-    return Image.fromarray(arr.astype(np.uint8), 'RGB')
+    # astype always copies; only convert when the dtype actually differs.
+    if arr.dtype != np.uint8:
+        arr = arr.astype(np.uint8)
+    return Image.fromarray(np.ascontiguousarray(arr), 'RGB')
 
-def numpy_to_qimage(arr: np.ndarray) -> QtGui.QImage:
+def numpy_to_qimage(arr: np.ndarray):
+    """Wrap a HxWx3 uint8 array in a QImage without copying the pixels.
+
+    QImage keeps a pointer into the NumPy buffer instead of `tobytes()`
+    duplicating it, so the caller must hold on to the returned backing
+    array for as long as the QImage is alive.
+    """
     h, w, c = arr.shape
     arr_contig = np.ascontiguousarray(arr)
     bytes_per_line = 3 * w
-    return QtGui.QImage(arr_contig.data.tobytes(), w, h, bytes_per_line, QtGui.QImage.Format_RGB888)
+    qimg = QtGui.QImage(arr_contig.data, w, h, bytes_per_line, QtGui.QImage.Format_RGB888)
+    return qimg, arr_contig
 
 # -----------------------
 # Encryption primitives
 # -----------------------
-def invert_pixels(arr: np.ndarray) -> np.ndarray:
-    """Simple value inversion: 255 - pixel"""
-    return 255 - arr
+def _invert_swar(arr: np.ndarray, out: np.ndarray):
+    """Invert contiguous uint8 data through a uint64 view.
+
+    XORing 8 bytes per ufunc step cuts the inner-loop iteration count 8x
+    compared with the byte-wise op; the sub-8-byte tail is handled as uint8.
+    """
+    src = arr.reshape(-1)
+    dst = out.reshape(-1)
+    n64 = src.size // 8 * 8
+    np.bitwise_xor(src[:n64].view(np.uint64), np.uint64(0xFFFFFFFFFFFFFFFF),
+                   out=dst[:n64].view(np.uint64))
+    if n64 != src.size:
+        np.bitwise_xor(src[n64:], np.uint8(0xFF), out=dst[n64:])
+
+@functools.lru_cache(maxsize=8)
+def _reversed_cols(w: int) -> np.ndarray:
+    """Reversed column index for a given width, cached per shape.
+
+    Only a handful of widths occur per session (the loaded images), so the
+    index table is built once and reused across clicks.
+    """
+    return np.arange(w - 1, -1, -1)
+
+def transform_pixels(arr: np.ndarray, flip: bool = False, invert: bool = False,
+                     out: np.ndarray = None) -> np.ndarray:
+    """Apply flip and/or inversion in a single pass over the image.
+
+    Reading through the (possibly reversed) source view and writing the
+    contiguous result in one NumPy op means a flip+invert composition moves
+    each byte through DRAM once instead of once per operation.
+    """
+    if out is None:
+        out = np.empty_like(arr)
+    if cp is not None and arr.nbytes > GPU_MIN_BYTES:
+        try:
+            src = cp.asarray(arr)
+            if flip:
+                src = src[:, ::-1]
+            res = cp.bitwise_not(src) if invert else cp.ascontiguousarray(src)
+            cp.asnumpy(res, out=out)
+            return out
+        except Exception:
+            # GPU OOM or a runtime/driver failure: the CPU path below
+            # handles the image fine, just slower.
+            pass
+    if invert and not flip and arr.flags.c_contiguous and out.flags.c_contiguous:
+        _invert_swar(arr, out)
+        return out
+    if invert:
+        np.bitwise_not(arr[:, ::-1] if flip else arr, out=out)
+    elif flip:
+        # Indexed take through the cached reversed-column table; faster
+        # than copying a negative-strided view.
+        np.take(arr, _reversed_cols(arr.shape[1]), axis=1, out=out)
+    else:
+        np.copyto(out, arr)
+    return out
+
+def invert_pixels(arr: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Simple value inversion: 255 - pixel (bitwise NOT for uint8)."""
+    return transform_pixels(arr, invert=True, out=out)
+
+def xor_pixels(arr: np.ndarray, seed: int, out: np.ndarray = None) -> np.ndarray:
+    """Keyed XOR stream cipher: each byte is XORed with a PRNG keystream.
+
+    The keystream is drawn as uint64 words (8 bytes per PRNG step) and the
+    XOR runs as a single vectorized pass. XOR is its own inverse, so
+    applying this twice with the same seed restores the image.
+    """
+    if out is None:
+        out = np.empty_like(arr)
+    n = arr.size
+    rng = np.random.default_rng(seed)
+    keystream = rng.integers(0, 1 << 64, size=(n + 7) // 8, dtype=np.uint64).view(np.uint8)[:n]
+    np.bitwise_xor(arr.reshape(-1), keystream, out=out.reshape(-1))
+    return out
+
+def flip_horizontal(arr: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Horizontal flip materialized as a contiguous array in one pass.
+
+    `np.fliplr` alone returns a negative-strided view that forces a second
+    per-pixel copy inside `numpy_to_qimage`; copying the reversed view
+    straight into a contiguous buffer does flip + materialize together.
+    """
+    return transform_pixels(arr, flip=True, out=out)
 
 # -----------------------
 # Save/load package
 # -----------------------
 def save_image(path: str, arr: np.ndarray):
-    numpy_to_pil(arr).save(path)
+    img = numpy_to_pil(arr)
+    if path.lower().endswith('.png'):
+        # Encrypted output is near-incompressible, so PNG's default DEFLATE
+        # level 6 burns time for little gain; level 1 saves several times
+        # faster at a modestly larger file.
+        img.save(path, optimize=False, compress_level=1)
+    else:
+        img.save(path)
 
 def save_package_npz(path: str, arr: np.ndarray, method: str, seed: int):
-    np.savez_compressed(path, data=arr, method=np.array([method]), seed=np.array([seed], dtype=np.uint64))
+    # Store-only: DEFLATE on natural images barely compresses but dominates
+    # wall time, so an uncompressed zip is 10x+ faster at similar size.
+    np.savez(path, data=arr, method=np.array([method]), seed=np.array([seed], dtype=np.uint64))
 
 def load_package_npz(path: str):
-    z = np.load(path, allow_pickle=True)
-    data = z['data']
-    method = str(z['method'][0])
-    seed = int(z['seed'][0])
+    with zipfile.ZipFile(path) as zf:
+        info = zf.NameToInfo.get('data.npy')
+        if info is not None and info.compress_type == zipfile.ZIP_STORED:
+            # Store-mode member: seek straight to the npy payload and read it
+            # in one shot, skipping ZipFile.open's buffered chunked reads.
+            # The on-disk local header can differ from FileHeader(), so read
+            # its actual name/extra lengths to locate the payload.
+            zf.fp.seek(info.header_offset)
+            header = zf.fp.read(zipfile.sizeFileHeader)
+            name_len, extra_len = struct.unpack(zipfile.structFileHeader, header)[10:12]
+            zf.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_len + extra_len)
+            data = np.lib.format.read_array(zf.fp, allow_pickle=False)
+        else:
+            with zf.open('data.npy') as f:
+                data = np.lib.format.read_array(f, allow_pickle=False)
+        with zf.open('method.npy') as f:
+            method = str(np.lib.format.read_array(f, allow_pickle=False)[0])
+        with zf.open('seed.npy') as f:
+            seed = int(np.lib.format.read_array(f, allow_pickle=False)[0])
     return data, method, seed
 
+# -----------------------
+# Background tasks
+# -----------------------
+class _TaskSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object)
+
+class PixelTask(QtCore.QRunnable):
+    """Runs a pixel operation on a pool thread and signals the result.
+
+    NumPy releases the GIL during the memory-bound kernels, so the UI
+    thread stays responsive while a large image is processed. The signal
+    is emitted from the worker and delivered queued on the main thread.
+    """
+    def __init__(self, fn):
+        super().__init__()
+        self.signals = _TaskSignals()
+        self._fn = fn
+
+    def run(self):
+        # An exception escaping a reimplemented Qt virtual aborts the whole
+        # process, so catch everything and report it through a signal.
+        try:
+            result = self._fn()
+        except Exception as exc:
+            self.signals.failed.emit(exc)
+        else:
+            self.signals.finished.emit(result)
+
 # -----------------------
 # MainWindow
 # -----------------------
@@ -149,13 +319,127 @@ class MainWindow(QtWidgets.QMainWindow):
         self.encrypted_arr = None
         self.decrypted_arr = None
 
+        # Scratch buffers reused across clicks so the hot path never
+        # allocates a fresh H*W*3 array per operation.
+        self._enc_buf = None
+        self._dec_buf = None
+
+        # Last (key, seed) pair so repeated clicks with the same password
+        # hash it once instead of once per click.
+        self._key_cache = (None, None)
+
+        # Pending label refreshes, coalesced to one render per event-loop
+        # tick so back-to-back operations don't repaint redundantly.
+        self._pending_labels = {}
+        self._refresh_scheduled = False
+
+        # Keep submitted tasks alive until their finished signal fires.
+        # Only one pixel task runs at a time: the scratch buffers are
+        # shared, so clicks while busy are ignored (buttons disabled) and
+        # a generation counter drops any result that is no longer the
+        # most recently submitted task.
+        self._active_tasks = set()
+        self._task_busy = False
+        self._task_gen = 0
+
+        # Rendered pixmaps keyed by a sampled hash of the source array, so
+        # redisplaying unchanged data skips the conversion entirely.
+        self._pixmap_cache = {}
+
+    def _set_task_buttons_enabled(self, enabled):
+        # Save and Load Package touch the scratch buffers too (encrypted_arr
+        # aliases _enc_buf), so they are locked out together with
+        # Encrypt/Decrypt while a task is writing.
+        for b in [self.btn_encrypt, self.btn_decrypt, self.btn_save_png, self.btn_load_pkg]:
+            b.setEnabled(enabled)
+
+    def _submit_task(self, fn, on_done):
+        self._task_busy = True
+        self._set_task_buttons_enabled(False)
+        self._task_gen += 1
+        task = PixelTask(fn)
+        self._active_tasks.add(task)
+
+        def _settle(task=task):
+            self._active_tasks.discard(task)
+            self._task_busy = False
+            self._set_task_buttons_enabled(True)
+
+        def _finish(result, gen=self._task_gen):
+            _settle()
+            if gen == self._task_gen:
+                on_done(result)
+
+        def _fail(exc):
+            _settle()
+            self.status_label.setText(f"Operation failed: {exc}")
+
+        task.signals.finished.connect(_finish)
+        task.signals.failed.connect(_fail)
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def _seed_for_key(self, key: str) -> int:
+        if self._key_cache[0] != key:
+            self._key_cache = (key, key_to_seed(key))
+        return self._key_cache[1]
+
+    def _scratch_enc(self, arr):
+        if self._enc_buf is None or self._enc_buf.shape != arr.shape:
+            self._enc_buf = np.empty_like(arr)
+        return self._enc_buf
+
+    def _scratch_dec(self, arr):
+        if self._dec_buf is None or self._dec_buf.shape != arr.shape:
+            self._dec_buf = np.empty_like(arr)
+        return self._dec_buf
+
     # -----------------------
     # UI helpers
     # -----------------------
     def show_in_label(self, label, arr):
-        qimg = numpy_to_qimage(arr)
+        # Record only the latest array per label and defer the actual
+        # pixmap conversion to the next event-loop tick; rapid sequences
+        # of operations then render each label once instead of per call.
+        self._pending_labels[label] = arr
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            QtCore.QTimer.singleShot(0, self._flush_labels)
+
+    def _flush_labels(self):
+        self._refresh_scheduled = False
+        pending, self._pending_labels = self._pending_labels, {}
+        for label, arr in pending.items():
+            self._render_label(label, arr)
+
+    @staticmethod
+    def _array_digest(arr):
+        # Hash ~1024 evenly spaced bytes plus the shape instead of the full
+        # buffer; collisions across genuinely different images are unlikely
+        # and the scan cost stays constant regardless of image size.
+        flat = arr.reshape(-1)
+        sample = np.ascontiguousarray(flat[::max(1, flat.size // 1024)])
+        h = hashlib.blake2b(sample.tobytes(), digest_size=8)
+        h.update(repr(arr.shape).encode())
+        return h.digest()
+
+    def _render_label(self, label, arr):
+        key = (id(label), self._array_digest(arr))
+        cached = self._pixmap_cache.get(key)
+        if cached is not None:
+            label.setPixmap(cached)
+            return
+        # Decimate with a cheap stride slice first so Qt's smooth scale
+        # filters a roughly label-sized array instead of the full image.
+        step = max(1, min(arr.shape[0] // label.height(), arr.shape[1] // label.width()) // 2)
+        if step > 1:
+            arr = arr[::step, ::step]
+        qimg, backing = numpy_to_qimage(arr)
+        label._backing = backing  # keep the buffer alive alongside the QImage
         pix = QtGui.QPixmap.fromImage(qimg).scaled(label.width(), label.height(),
                                                     QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        if len(self._pixmap_cache) > 32:
+            self._pixmap_cache.clear()
+        self._pixmap_cache[key] = pix
         label.setPixmap(pix)
 
     # -----------------------
@@ -172,46 +456,69 @@ class MainWindow(QtWidgets.QMainWindow):
         self.status_label.setText(f"Loaded {path}")
 
     def encrypt_image(self):
+        if self._task_busy:
+            return  # a task is writing the scratch buffers; drop the click
         if self.original_arr is None:
             self.status_label.setText("No image loaded")
             return
         method = self.cmb_method.currentText()
+        arr = self.original_arr
+        buf = self._scratch_enc(arr)
         if method == "xor":
-            out = np.fliplr(self.original_arr)  # Just flip horizontally
+            seed = self._seed_for_key(self.line_key.text())
+            fn = lambda: xor_pixels(arr, seed, out=buf)
         elif method == "invert":
-            out = invert_pixels(self.original_arr)
+            fn = lambda: transform_pixels(arr, invert=True, out=buf)
         else:
-            out = self.original_arr.copy()
+            fn = lambda: transform_pixels(arr, out=buf)
+        self.status_label.setText("Encrypting...")
+        self._submit_task(fn, self._on_encrypted)
+
+    def _on_encrypted(self, out):
         self.encrypted_arr = out
         self.show_in_label(self.lbl_encrypted, out)
         self.status_label.setText("Encryption complete")
 
     def decrypt_image(self):
+        if self._task_busy:
+            return  # a task is writing the scratch buffers; drop the click
         if self.encrypted_arr is None:
             self.status_label.setText("No encrypted image")
             return
         method = self.cmb_method.currentText()
+        arr = self.encrypted_arr
+        buf = self._scratch_dec(arr)
         if method == "xor":
-            out = np.fliplr(self.encrypted_arr)  # Flip back
+            seed = self._seed_for_key(self.line_key.text())
+            fn = lambda: xor_pixels(arr, seed, out=buf)
         elif method == "invert":
-            out = invert_pixels(self.encrypted_arr)
+            fn = lambda: transform_pixels(arr, invert=True, out=buf)
         else:
-            out = self.encrypted_arr.copy()
+            fn = lambda: transform_pixels(arr, out=buf)
+        self.status_label.setText("Decrypting...")
+        self._submit_task(fn, self._on_decrypted)
+
+    def _on_decrypted(self, out):
         self.decrypted_arr = out
         self.show_in_label(self.lbl_decrypted, out)
         self.status_label.setText("Decryption complete")
 
     def save_image_file(self):
+        if self._task_busy:
+            return  # a task may be mid-write in the buffer being saved
         if self.encrypted_arr is None:
             self.status_label.setText("No image to save")
             return
-        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Image", "", "PNG Image (*.png)")
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Image", "",
+                                                        "PNG Image (*.png);;BMP Image (*.bmp)")
         if not path:
             return
         save_image(path, self.encrypted_arr)
         self.status_label.setText(f"Saved {path}")
 
     def load_package(self):
+        if self._task_busy:
+            return  # an in-flight result would overwrite the loaded package
         path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Package", "", "NPZ Package (*.npz)")
         if not path:
             return